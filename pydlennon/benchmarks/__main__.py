@@ -0,0 +1,42 @@
+"""
+Run the benchmark suite:
+
+    $ python3 -m pydlennon.benchmarks -o results.json
+    $ python3 -m pydlennon.benchmarks -b results.json -t 0.1
+
+With a baseline, the exit status is 1 if any benchmark regressed by more than the
+tolerance, or has a baseline value but failed or did not run.
+"""
+
+import argparse
+import sys
+
+from . import harness
+from . import patterns, contexts, extensions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m pydlennon.benchmarks")
+    parser.add_argument("-k", "--pattern", default="*", 
+                        help="Only run benchmarks whose name matches this glob pattern")
+    parser.add_argument("-o", "--output", 
+                        help="Write the results to this JSON file")
+    parser.add_argument("-b", "--baseline", 
+                        help="Compare against the results in this JSON file")
+    parser.add_argument("-t", "--tolerance", type=float, default=0.1,
+                        help="The relative slowdown flagged as a regression (default: 0.1)")
+    args = parser.parse_args(argv)
+
+    results     = harness.run(args.pattern)
+    baseline    = harness.load(args.baseline) if args.baseline else {}
+    regressions = harness.compare(results, baseline, args.tolerance, args.pattern)
+
+    harness.report(results, baseline, regressions)
+    if args.output:
+        harness.save(args.output, results)
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit( main() )
@@ -0,0 +1,31 @@
+
+import numpy
+
+from pydlennon.contexts.seeded_rng import SeededRng
+
+from .harness import benchmark
+
+# -----------------------------------------------------------------------------
+
+@benchmark("contexts.seeded_rng.standard_normal_1e6")
+def seeded_rng_standard_normal():
+    def draw():
+        with SeededRng(0) as rng:
+            rng.standard_normal(10**6)
+    return draw
+
+@benchmark("contexts.seeded_rng.fill_standard_normal_1e7", repeat=3)
+def seeded_rng_fill():
+    out = numpy.empty(10**7)
+    def draw():
+        with SeededRng(0) as rng:
+            rng.fill(out)
+    return draw
+
+@benchmark("contexts.seeded_rng.fill_standard_normal_1e7_serial", repeat=3)
+def seeded_rng_fill_serial():
+    out = numpy.empty(10**7)
+    def draw():
+        with SeededRng(0) as rng:
+            rng.fill(out, threads=1)
+    return draw
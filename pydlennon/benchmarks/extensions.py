@@ -0,0 +1,54 @@
+
+import numpy as np
+import pandas as pd
+
+from patsy import dmatrix
+
+from pydlennon.extensions.patsy.patsy import FullRankOneHot
+
+from .harness import benchmark
+
+# -----------------------------------------------------------------------------
+
+@benchmark("extensions.patsy.full_rank_one_hot_1e5", repeat=3)
+def full_rank_one_hot():
+    rng = np.random.default_rng(0)
+    df  = pd.DataFrame({
+        "x" : rng.standard_normal(10**5),
+        "g" : pd.Categorical( rng.integers(0, 10, 10**5) )
+    })
+    return lambda: dmatrix("x + C(g, FullRankOneHot)", df)
+
+# -----------------------------------------------------------------------------
+
+def _axes():
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    import pydlennon.extensions.matplotlib
+    pydlennon.extensions.matplotlib.install()
+
+    figure = Figure()
+    FigureCanvasAgg(figure)
+    return figure, figure.add_subplot()
+
+@benchmark("extensions.matplotlib.abline_100", repeat=3)
+def abline():
+    rng = np.random.default_rng(0)
+    a, b = rng.standard_normal((2, 100))
+    def render():
+        figure, ax = _axes()
+        for intercept, slope in zip(a, b):
+            ax.abline(intercept, slope)
+        figure.canvas.draw()
+    return render
+
+@benchmark("extensions.matplotlib.ablines_100", repeat=3)
+def ablines():
+    rng = np.random.default_rng(0)
+    a, b = rng.standard_normal((2, 100))
+    def render():
+        figure, ax = _axes()
+        ax.ablines(a, b)
+        figure.canvas.draw()
+    return render
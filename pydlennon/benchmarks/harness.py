@@ -0,0 +1,103 @@
+
+import fnmatch
+import json
+import platform
+import sys
+import timeit
+
+# -----------------------------------------------------------------------------
+
+_benchmarks = []
+
+def benchmark(name, repeat=5):
+    """
+    Register a timing benchmark.  The decorated function does any setup and returns 
+    a zero-argument callable; the recorded value is the best time per call, in 
+    seconds, over the given number of repeats.
+    """
+    def decorator(setup):
+        def measure():
+            stmt    = setup()
+            timer   = timeit.Timer(stmt)
+            number, _ = timer.autorange()
+            return min( timer.repeat(repeat, number) ) / number
+
+        _benchmarks.append( (name, measure, "s") )
+        return setup
+    return decorator
+
+
+def measurement(name, unit):
+    """
+    Register a benchmark whose decorated function returns the recorded value itself,
+    e.g. a memory footprint.  As with timings, lower values are better.
+    """
+    def decorator(measure):
+        _benchmarks.append( (name, measure, unit) )
+        return measure
+    return decorator
+
+# -----------------------------------------------------------------------------
+
+def run(pattern="*"):
+    results = {}
+    for name, measure, unit in _benchmarks:
+        if not fnmatch.fnmatch(name, pattern):
+            continue
+        try:
+            results[name] = { "value" : measure(), "unit" : unit }
+        except Exception as e:
+            results[name] = { "error" : "{0}: {1}".format(type(e).__name__, e) }
+    return results
+
+
+def compare(results, baseline, tolerance, pattern="*"):
+    """
+    Returns the (name, baseline value, value) of each result that is worse than the 
+    baseline by more than the given relative tolerance.  A benchmark with a baseline 
+    value that now errors, or did not run, is also returned, with a value of None.
+    Baseline entries not matching pattern are ignored.
+    """
+    regressions = []
+    for name, base in sorted(baseline.items()):
+        if "value" not in base or not fnmatch.fnmatch(name, pattern):
+            continue
+
+        value = results.get(name, {}).get("value")
+        if value is None or value > base["value"] * (1.0 + tolerance):
+            regressions.append( (name, base["value"], value) )
+    return regressions
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def save(path, results):
+    document = {
+        "python"    : sys.version.split()[0],
+        "platform"  : platform.platform(),
+        "results"   : results
+    }
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+
+
+def report(results, baseline={}, regressions=[], file=sys.stdout):
+    flagged = set( name for name, _, _ in regressions )
+    for name in sorted( set(results).union(flagged) ):
+        result = results.get(name, {})
+        if "value" in result:
+            line = "{0:40} {1:12.4g} {2:6}".format(name, result["value"], result["unit"])
+            base = baseline.get(name, {})
+            if "value" in base and base["value"] > 0:
+                line += " {0:+8.1%}".format( result["value"] / base["value"] - 1.0 )
+        elif "error" in result:
+            line = "{0:40} ERROR {1}".format(name, result["error"])
+        else:
+            line = "{0:40} MISSING".format(name)
+
+        if name in flagged:
+            line += "  REGRESSION"
+        print(line, file=file)
@@ -0,0 +1,103 @@
+
+import gc
+import tracemalloc
+
+from pydlennon.patterns.instrumented import Instrumented
+from pydlennon.patterns.proxy import Proxy
+
+from .harness import benchmark, measurement
+
+# -----------------------------------------------------------------------------
+
+class Foo(object):
+    @classmethod
+    def c(cls):
+        pass
+
+    def f(self):
+        pass
+
+    def g(self):
+        pass
+
+
+def _proxy_class():
+    @Proxy("foo", Foo, ['c', 'g'])
+    class Bar(object):
+        def __init__(self):
+            self.foo = Foo()
+    return Bar
+
+def _instrumented_class():
+    @Instrumented()
+    class Qux(Foo):
+        pass
+    return Qux
+
+# -----------------------------------------------------------------------------
+
+@benchmark("patterns.proxy.decorate")
+def proxy_decorate():
+    return _proxy_class
+
+@benchmark("patterns.proxy.getattr")
+def proxy_getattr():
+    bar = _proxy_class()()
+    return lambda: bar.g
+
+@benchmark("patterns.proxy.call")
+def proxy_call():
+    bar = _proxy_class()()
+    return lambda: bar.g()
+
+@benchmark("patterns.instrumented.decorate")
+def instrumented_decorate():
+    return _instrumented_class
+
+@benchmark("patterns.instrumented.getattr")
+def instrumented_getattr():
+    qux = _instrumented_class()()
+    return lambda: qux.g
+
+@benchmark("patterns.instrumented.call")
+def instrumented_call():
+    qux = _instrumented_class()()
+    return lambda: qux.g()
+
+# -----------------------------------------------------------------------------
+
+def _bytes_per_instance(klass, n=100000):
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+
+    try:
+        gc.collect()
+        before      = tracemalloc.get_traced_memory()[0]
+        instances   = [ klass() for _ in range(n) ]
+        after       = tracemalloc.get_traced_memory()[0]
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    # exclude the list holding the instances
+    return (after - before - instances.__sizeof__()) / n
+
+_foo = Foo()
+
+@measurement("patterns.proxy.instance_bytes.dict", "B")
+def proxy_instance_bytes_dict():
+    @Proxy("foo", Foo, ['c', 'g'])
+    class Bar(object):
+        def __init__(self):
+            self.foo = _foo
+    return _bytes_per_instance(Bar)
+
+@measurement("patterns.proxy.instance_bytes.slots", "B")
+def proxy_instance_bytes_slots():
+    @Proxy("foo", Foo, ['c', 'g'])
+    class Bar(object):
+        __slots__ = ()
+        def __init__(self):
+            self.foo = _foo
+    return _bytes_per_instance(Bar)
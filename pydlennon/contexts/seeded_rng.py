@@ -1,10 +1,18 @@
 
+import concurrent.futures
+import os
+
 import numpy
 
 class SeededRng(object):
+
+    # Generator methods that can fill an existing array
+    fill_methods = ("random", "standard_normal", "standard_exponential", "standard_gamma")
+
     def __init__(self, seed):
-        self._seed = seed
-        self._rng  = None
+        self._seed      = seed
+        self._rng       = None
+        self._seedseq   = None
 
     def __getattr__(self, k):
         if hasattr(self._rng, k):
@@ -13,9 +21,65 @@ class SeededRng(object):
             raise AttributeError(k)
 
     def __enter__(self):
-        self._rng = numpy.random.default_rng(self._seed)
+        self._rng       = numpy.random.default_rng(self._seed)
+        self._seedseq   = self._copy_seedseq()
         return self
 
+    def _copy_seedseq(self):
+        """
+        A copy of the seed sequence behind the Generator.  spawn() advances a SeedSequence,
+        so fill draws from a copy taken on entry; a SeedSequence seed then gives the same
+        child streams in each with block.
+        """
+        bit_generator   = self._rng.bit_generator
+        seedseq         = getattr(bit_generator, "seed_seq", None) or getattr(bit_generator, "_seed_seq", None)
+
+        if not isinstance(seedseq, numpy.random.SeedSequence):
+            # e.g. a bit generator whose state was set directly
+            return numpy.random.SeedSequence( self._rng.integers(1 << 63, size=4) )
+
+        return numpy.random.SeedSequence(
+            seedseq.entropy,
+            spawn_key           = seedseq.spawn_key,
+            pool_size           = seedseq.pool_size,
+            n_children_spawned  = seedseq.n_children_spawned
+        )
+
     def __exit__(self, exc_typ, exc_value, exc_tb):
-        self._rng = None
+        self._rng       = None
+        self._seedseq   = None
+
+    def fill(self, out, method="standard_normal", block_size=1 << 20, threads=None, **kw):
+        """
+        Fill out in place, across threads.  out is split into blocks of block_size elements
+        and each block is drawn from its own child stream of the seed, so the result
+        depends on the seed, block_size and the number of earlier fill calls in this with
+        block, but not on the number of threads.  out may be a numpy.memmap.  The seed may 
+        be anything numpy.random.default_rng accepts.
+
+        Child streams are independent of the stream used by the other Generator methods.
+        """
+        if self._rng is None:
+            raise RuntimeError("SeededRng.fill must be called within its with block.")
+        if method not in self.fill_methods:
+            raise ValueError("method must be one of {0}.".format(", ".join(self.fill_methods)))
+        if not (out.flags.c_contiguous or out.flags.f_contiguous):
+            raise ValueError("out must be contiguous.")
+
+        flat        = out.ravel(order="K")
+        n_blocks    = -(-flat.size // block_size)
+        seeds       = self._seedseq.spawn(n_blocks)
+
+        def draw(i):
+            rng = numpy.random.default_rng(seeds[i])
+            getattr(rng, method)(out=flat[i * block_size : (i + 1) * block_size], dtype=flat.dtype, **kw)
+
+        threads = min(threads or os.cpu_count() or 1, n_blocks)
+        if threads <= 1:
+            for i in range(n_blocks):
+                draw(i)
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+                list( executor.map(draw, range(n_blocks)) )
 
+        return out
@@ -1,4 +1,66 @@
-import matplotlib
+import sys
 
-from .abline import _abline
-setattr(matplotlib.axes.Subplot, 'abline', _abline)
+"""
+
+    Importing this package does not import matplotlib.  The abline and ablines
+    methods are added to matplotlib.axes.Axes by install(), which runs
+    immediately if matplotlib.axes is already loaded and is otherwise deferred
+    until matplotlib.axes is first imported.
+
+"""
+
+_installed = False
+
+def install():
+    """
+    Add abline and ablines to matplotlib.axes.Axes.  This imports matplotlib.axes if
+    necessary and is safe to call more than once.
+    """
+    global _installed
+
+    _uninstall_hook()
+    if _installed:
+        return
+
+    from matplotlib.axes import Axes
+    from .abline import _abline, _ablines
+
+    setattr(Axes, 'abline', _abline)
+    setattr(Axes, 'ablines', _ablines)
+    _installed = True
+
+
+class _InstallHook(object):
+    """
+    A meta path finder that calls install() once matplotlib.axes has been executed.
+    """
+    def find_spec(self, fullname, path, target=None):
+        if fullname != "matplotlib.axes":
+            return None
+
+        import importlib.util
+
+        _uninstall_hook()
+        spec = importlib.util.find_spec(fullname)
+        if spec is None or spec.loader is None:
+            return spec
+
+        exec_module = spec.loader.exec_module
+        def exec_and_install(module):
+            exec_module(module)
+            install()
+        spec.loader.exec_module = exec_and_install
+
+        return spec
+
+_hook = _InstallHook()
+
+def _uninstall_hook():
+    if _hook in sys.meta_path:
+        sys.meta_path.remove(_hook)
+
+
+if "matplotlib.axes" in sys.modules:
+    install()
+else:
+    sys.meta_path.insert(0, _hook)
@@ -1,24 +1,96 @@
 
 import matplotlib
-from matplotlib.pyplot import gca
+import matplotlib.artist
+import matplotlib.collections
+import matplotlib.lines
+import numpy as np
 
-class LineAb(matplotlib.lines._AxLine):
-    def __init__(self, intercept, slope, *args, **kw):
-        super().__init__([0,1], [intercept,intercept+slope], *args, **kw)
+# matplotlib 3.8 made the axline artist public
+_AxLine = getattr(matplotlib.lines, "AxLine", None) or matplotlib.lines._AxLine
+
+class LineAb(_AxLine):
+    def __init__(self, intercept, slope, **kw):
+        super().__init__((0, intercept), None, slope, **kw)
+
+    def set_coefficients(self, intercept, slope):
+        # _AxLine recomputes its transform from these at draw time
+        self._xy1   = (0, intercept)
+        self._slope = slope
+        self.stale  = True
+
+class LineAbCollection(matplotlib.collections.LineCollection):
+    """
+    Many ab-lines in a single artist.  Segments are recomputed at draw time, clipped
+    to the current view limits in one vectorized pass; lines that miss the view are
+    set to NaN rather than dropped, so per-line properties (colors, widths) stay
+    aligned.
+
+    As with LineAb, the points at x = 0 and x = 1 contribute to the data limits.
+    Coefficients may be updated in place with set_coefficients, e.g. between blits;
+    this does not change the data limits or rescale the view.
+    """
+    def __init__(self, intercepts, slopes, *args, **kw):
+        self._set_coefficients(intercepts, slopes)
+        super().__init__(self._segments(0.0, 1.0), *args, **kw)
+
+    def _set_coefficients(self, intercepts, slopes):
+        self._intercepts, self._slopes = np.broadcast_arrays(
+            np.ravel(np.asarray(intercepts, dtype=float)),
+            np.ravel(np.asarray(slopes, dtype=float))
+        )
+
+    def set_coefficients(self, intercepts, slopes):
+        self._set_coefficients(intercepts, slopes)
+        self.set_segments(self._segments(0.0, 1.0))
+
+    def _segments(self, x0, x1, y0=-np.inf, y1=np.inf):
+        a = self._intercepts[:,None]
+        b = self._slopes[:,None]
+
+        # The x-interval on which each line lies within [y0, y1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t0 = (y0 - a) / b
+            t1 = (y1 - a) / b
+        flat = (b == 0)
+        lo = np.where(flat, x0, np.maximum(x0, np.minimum(t0, t1)))
+        hi = np.where(flat, x1, np.minimum(x1, np.maximum(t0, t1)))
+        visible = np.where(flat, (y0 <= a) & (a <= y1), lo <= hi)
+
+        x = np.where(visible, np.hstack([lo, hi]), np.nan)
+        return np.stack([x, a + b * x], axis=-1)
+
+    @matplotlib.artist.allow_rasterization
+    def draw(self, renderer):
+        if self.axes is not None:
+            x0, x1 = sorted(self.axes.viewLim.intervalx)
+            y0, y1 = sorted(self.axes.viewLim.intervaly)
+            self.set_segments(self._segments(x0, x1, y0, y1))
+        super().draw(renderer)
 
 def _abline(self, intercept, slope, **kwargs):
+    # As with Axes.axline, the points at x = 0 and x = 1 contribute to the data limits
+    datalim = [] if "transform" in kwargs else [(0, intercept), (1, intercept + slope)]
+
     line = LineAb(intercept, slope, **kwargs)
     self._set_artist_props(line)
     if line.get_clip_path() is None:
         line.set_clip_path(self.patch)
     if not line.get_label():
-        line.set_label(f"_line{len(self.lines)}")
-    self.lines.append(line)
-    line._remove_method = self.lines.remove
-    
+        line.set_label(f"_child{len(self._children)}")
+    self._children.append(line)
+    line._remove_method = self._children.remove
+    self.update_datalim(datalim)
+
     self._request_autoscale_view()
     return line
 
+def _ablines(self, intercepts, slopes, **kwargs):
+    lines = LineAbCollection(intercepts, slopes, **kwargs)
+    self.add_collection(lines, autolim=True)
+
+    self._request_autoscale_view()
+    return lines
+
 # setattr(matplotlib.pyplot, 'abline', abline)
 # def abline(intercept, slope, **kwargs):
-#     return gca().abline(intercept, slope, **kwargs)
+#     return matplotlib.pyplot.gca().abline(intercept, slope, **kwargs)
@@ -0,0 +1,59 @@
+
+class BlitManager(object):
+    """
+    Redraw a set of animated artists over a cached background.  The background is
+    captured on every full draw of the canvas (e.g. a resize), with the managed
+    artists excluded; update() then restores it and redraws only those artists.
+
+    Typical use with ab-lines:
+
+        lines = ax.ablines(intercepts, slopes, animated=True)
+        bm = BlitManager(fig.canvas, [lines])
+        plt.show(block=False)
+        ...
+        lines.set_coefficients(new_intercepts, new_slopes)
+        bm.update()
+
+    Blitting does not rescale the view; set the axis limits up front.
+
+    Args:
+        canvas(FigureCanvasBase):   The canvas to draw on.
+        artists(list):              Artists to manage; each is marked animated.
+    """
+
+    def __init__(self, canvas, artists=()):
+        self.canvas         = canvas
+        self._background    = None
+        self._artists       = []
+
+        for artist in artists:
+            self.add_artist(artist)
+
+        self._cid = canvas.mpl_connect("draw_event", self._on_draw)
+
+    def add_artist(self, artist):
+        if artist.figure is not self.canvas.figure:
+            raise RuntimeError("The artist is not in the managed figure.")
+        artist.set_animated(True)
+        self._artists.append(artist)
+
+    def disconnect(self):
+        self.canvas.mpl_disconnect(self._cid)
+
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        figure = self.canvas.figure
+        for artist in self._artists:
+            figure.draw_artist(artist)
+
+    def update(self):
+        if self._background is None:
+            self._on_draw(None)
+        else:
+            self.canvas.restore_region(self._background)
+            self._draw_animated()
+            self.canvas.blit(self.canvas.figure.bbox)
+        self.canvas.flush_events()
@@ -0,0 +1,250 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from patsy import ContrastMatrix, DesignInfo, DesignMatrix, EvalEnvironment, EvalFactor, LookupFactor, ModelDesc, dmatrix
+
+
+"""
+
+    A persistent, on-disk cache for design matrices.
+
+    Building a design matrix from a large input file is expensive, and the result
+    only depends on the model description and the input.  DesignMatrixCache
+    stores each result as a raw .npy file alongside a small JSON file of column
+    metadata.  On a cache hit the matrix is mapped with numpy.memmap (via
+    np.load(mmap_mode=...)) and wrapped without copying.
+
+    Patsy does not support serializing DesignInfo term codings, so a cached
+    matrix carries its column names but cannot be used with
+    build_design_matrices to encode new data.
+
+"""
+
+def fingerprint(*paths, content=False):
+    """
+    Fingerprint a set of input files.  By default, this uses the absolute path, size
+    and modification time of each file; with content=True, the file contents are
+    hashed as well.
+    """
+    h = hashlib.sha256()
+    for path in paths:
+        st = os.stat(path)
+        h.update(os.path.abspath(path).encode())
+        h.update("{0}:{1}".format(st.st_size, st.st_mtime_ns).encode())
+        if content:
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+    return h.hexdigest()
+
+
+def _describe_contrast(contrast):
+    """
+    A stable description of a contrast: None, a coding class, an instance of one, or a
+    ContrastMatrix.
+    """
+    if contrast is None:
+        return None
+    if isinstance(contrast, type):
+        return "{0}.{1}".format(contrast.__module__, contrast.__qualname__)
+    if isinstance(contrast, ContrastMatrix):
+        return [ contrast.matrix.tolist(), [ str(c) for c in contrast.column_suffixes ] ]
+    if not hasattr(contrast, "__dict__"):
+        raise ValueError("DesignMatrixCache cannot describe the contrast {0!r}.".format(contrast))
+    return [
+        _describe_contrast(type(contrast)),
+        sorted( [k, repr(v)] for k,v in vars(contrast).items() )
+    ]
+
+
+def _describe_factor(factor):
+    """
+    A stable description of a factor, covering everything that changes its encoding:
+    the fields used by its __eq__, as well as its type and name.
+    """
+    typename = "{0}.{1}".format(type(factor).__module__, type(factor).__qualname__)
+
+    if isinstance(factor, LookupFactor):
+        levels = factor._levels
+        return [
+            typename, factor.name(), factor._varname, bool(factor._force_categorical),
+            _describe_contrast(factor._contrast),
+            None if levels is None else [ repr(l) for l in levels ]
+        ]
+    if isinstance(factor, EvalFactor):
+        return [ typename, factor.name(), factor.code ]
+
+    raise ValueError("DesignMatrixCache cannot describe the factor {0!r}.".format(factor))
+
+
+def _describe(formula_like):
+    """
+    A stable description of a model.  For a ModelDesc, each factor is described by its
+    code or variable, its coding and its name, so that renamed factors (e.g.
+    EvalFactorRenamed) and differently coded factors produce distinct keys.
+    """
+    if isinstance(formula_like, ModelDesc):
+        return [
+            [
+                [ _describe_factor(f) for f in term.factors ]
+                for term in termlist
+            ]
+            for termlist in (formula_like.lhs_termlist, formula_like.rhs_termlist)
+        ]
+    return str(formula_like)
+
+
+def _index_levels(index):
+    """
+    The levels of an index as arrays that np.save can store without pickling, and that
+    load back to the same values.  Object levels must hold only strings, which are
+    stored as unicode and restored as objects.  Timezone-aware datetimes are stored in
+    UTC, with the timezone kept in the level metadata.  Anything else raises a ValueError.
+    """
+    levels = []
+    for i in range(index.nlevels):
+        level   = index.get_level_values(i)
+        meta    = { "name" : level.name, "str" : False, "tz" : None }
+
+        if isinstance(level.dtype, pd.DatetimeTZDtype):
+            meta["tz"]  = str(level.tz)
+            values      = level.tz_convert("UTC").tz_localize(None).to_numpy()
+            if not _restore_level(values, meta).equals(level):
+                raise ValueError(
+                    "DesignMatrixCache cannot store an index level of dtype '{0}'.".format(level.dtype)
+                )
+        else:
+            values      = np.asarray(level)
+            meta["str"] = values.dtype == object and all( isinstance(v, str) for v in values )
+
+            if meta["str"]:
+                values = values.astype(str)
+            elif values.dtype != level.dtype or values.dtype.kind not in "biufcmM":
+                raise ValueError(
+                    "DesignMatrixCache cannot store an index level of dtype '{0}'.".format(level.dtype)
+                )
+
+        if level.name is not None and not isinstance(level.name, str):
+            raise ValueError("DesignMatrixCache requires index names to be strings.")
+
+        levels.append( (meta, values) )
+    return levels
+
+
+def _restore_level(values, meta):
+    if meta.get("tz") is not None:
+        return pd.DatetimeIndex(values).tz_localize("UTC").tz_convert(meta["tz"])
+    return pd.Index( values.astype(object) if meta["str"] else values )
+
+
+class DesignMatrixCache(object):
+    """
+    Args:
+        cache_dir(str):     The directory holding cached matrices; created if missing.
+        mmap_mode(str):     Passed to np.load on a cache hit.  The default, 'r', maps
+                            the matrix read-only.
+    """
+
+    def __init__(self, cache_dir, mmap_mode="r"):
+        self.cache_dir = cache_dir
+        self.mmap_mode = mmap_mode
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, formula_like, fingerprint):
+        desc = json.dumps([_describe(formula_like), fingerprint])
+        return hashlib.sha256(desc.encode()).hexdigest()
+
+    def _path(self, key, suffix):
+        return os.path.join(self.cache_dir, key + suffix)
+
+    def dmatrix(self, formula_like, data, fingerprint, eval_env=0, return_type="matrix"):
+        """
+        A caching dmatrix.  On a miss, data (or data(), if callable, so that the input
+        need not be loaded on a hit) is passed to patsy.dmatrix and the result is
+        stored.  The result is then mapped from the cache.
+
+        The key does not depend on return_type: 'matrix' returns a DesignMatrix, and
+        'dataframe' returns a DataFrame, both backed by the same mapped file.  A row index
+        that cannot be stored (see _index_levels) only raises a ValueError for
+        'dataframe'; the matrix is cached regardless.
+        """
+        eval_env = EvalEnvironment.capture(eval_env, reference=1)
+        key = self.key(formula_like, fingerprint)
+
+        if not os.path.exists(self._path(key, ".json")):
+            if callable(data):
+                data = data()
+            X = dmatrix(formula_like, data, eval_env=eval_env, return_type="dataframe")
+            self._store(key, X)
+
+        return self._load(key, return_type)
+
+    def _store(self, key, X):
+        # X is always built as a dataframe, so that the row index is available to
+        # later calls with return_type='dataframe'
+        meta = {
+            "columns"   : [ str(c) for c in X.columns ],
+            "index"     : []
+        }
+
+        # An index that cannot be stored does not prevent caching the matrix; it is
+        # only an error when a dataframe is requested
+        if not X.index.equals( pd.RangeIndex(len(X)) ):
+            try:
+                levels = _index_levels(X.index)
+            except ValueError as e:
+                meta["index"] = str(e)
+            else:
+                for i, (level, values) in enumerate(levels):
+                    self._atomic_save(key, ".index{0}.npy".format(i), values)
+                    meta["index"].append(level)
+
+        self._atomic_save(key, ".npy", np.ascontiguousarray(X.to_numpy()))
+
+        # The metadata is written last; its presence marks a complete entry
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir)
+        with os.fdopen(fd, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self._path(key, ".json"))
+
+    def _atomic_save(self, key, suffix, arr):
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir)
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, arr, allow_pickle=False)
+        os.replace(tmp, self._path(key, suffix))
+
+    def _load(self, key, return_type):
+        with open(self._path(key, ".json")) as f:
+            meta = json.load(f)
+        values = np.load(self._path(key, ".npy"), mmap_mode=self.mmap_mode)
+
+        if return_type == "dataframe":
+            return pd.DataFrame(values, columns=meta["columns"], index=self._load_index(key, meta), copy=False)
+
+        return DesignMatrix(values, DesignInfo(meta["columns"]))
+
+    def _load_index(self, key, meta):
+        if isinstance(meta["index"], str):
+            raise ValueError(meta["index"])
+        if not meta["index"]:
+            return None
+
+        levels = []
+        for i, level in enumerate(meta["index"]):
+            values = np.load(self._path(key, ".index{0}.npy".format(i)))
+            levels.append( _restore_level(values, level) )
+
+        names = [ level["name"] for level in meta["index"] ]
+        if len(levels) == 1:
+            return levels[0].rename(names[0])
+        return pd.MultiIndex.from_arrays(levels, names=names)
+
+    def clear(self):
+        for name in os.listdir(self.cache_dir):
+            if name.endswith((".npy", ".json")):
+                os.remove(os.path.join(self.cache_dir, name))
@@ -1,55 +1,206 @@
 
+import collections
+import functools
 import logging
+import tracemalloc
 import types
+import warnings
+
+from .metrics import class_label, default_registry
+
+
+# -----------------------------------------------------------------------------
+
+ALLOCATION_BYTES_BOUNDS     = (0, 1 << 10, 1 << 16, 1 << 20, 1 << 24, 1 << 28)
+ALLOCATION_BLOCKS_BOUNDS    = (0, 1, 10, 100, 1000, 10000)
+
+class AllocationTracker(object):
+    """
+    Records the net bytes allocated by calls through a descriptor.  Tracing is left to 
+    the caller (tracemalloc.start(), or PYTHONTRACEMALLOC=1); calls made while tracing 
+    is off are not measured.
+
+    With sample=1, every call is measured as the difference of tracemalloc snapshots 
+    taken around it, which also gives the net number of blocks.  Snapshots cost time in 
+    proportion to the number of live traced blocks.  With sample=N > 1, one call in N 
+    is measured from tracemalloc.get_traced_memory(), which is cheap but gives bytes 
+    only.
+
+    Allocations made by other threads during a measured call are included.
+    """
+
+    _filters = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__)
+    ]
+
+    def __init__(self, klass, key, registry=None, sample=1):
+        self._sample    = sample
+        self._calls     = 0
+        self._warned    = False
+
+        registry        = default_registry if registry is None else registry
+        labels          = { "class" : class_label(klass), "attr" : key }
+        self._bytes     = registry.histogram(
+                            "pydlennon_instrumented_alloc_bytes", labels,
+                            help = "Net bytes allocated per sampled call through Instrumented descriptors.",
+                            bounds = ALLOCATION_BYTES_BOUNDS
+                        )
+        self._blocks    = None
+        if sample == 1:
+            self._blocks = registry.histogram(
+                            "pydlennon_instrumented_alloc_blocks", labels,
+                            help = "Net blocks allocated per call through Instrumented descriptors.",
+                            bounds = ALLOCATION_BLOCKS_BOUNDS
+                        )
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(self._filters)
+
+    def __call__(self, fn, *args, **kw):
+        self._calls += 1
+        if self._calls % self._sample:
+            return fn(*args, **kw)
+
+        if not tracemalloc.is_tracing():
+            if not self._warned:
+                self._warned = True
+                warnings.warn("Allocations are only tracked while tracemalloc is tracing.", RuntimeWarning)
+            return fn(*args, **kw)
+
+        if self._blocks is None:
+            before = tracemalloc.get_traced_memory()[0]
+            try:
+                return fn(*args, **kw)
+            finally:
+                self._bytes.observe( tracemalloc.get_traced_memory()[0] - before )
+
+        before = self._snapshot()
+        try:
+            return fn(*args, **kw)
+        finally:
+            stats = self._snapshot().compare_to(before, "filename")
+            self._bytes.observe( sum( stat.size_diff for stat in stats ) )
+            self._blocks.observe( sum( stat.count_diff for stat in stats ) )
+
+    def wrap(self, fn):
+        # Keep bound methods bound, so that __self__ and inspect.ismethod still work
+        if isinstance(fn, types.MethodType):
+            return types.MethodType( self.wrap(fn.__func__), fn.__self__ )
+
+        @functools.wraps(fn)
+        def tracked(*args, **kw):
+            return self(fn, *args, **kw)
+        return tracked
+
+
+AllocationRecord = collections.namedtuple("AllocationRecord", ["klass", "attr", "calls", "bytes", "blocks"])
+
+def allocation_report(klass=None, registry=None):
+    """
+    Returns an AllocationRecord for each attribute tracked by Instrumented(track_allocations=True),
+    optionally restricted to one class (a class, or its metrics.class_label), ranked by
+    net bytes allocated.  Calls counts only the measured calls; blocks is None for
+    sampled attributes.
+    """
+    registry    = default_registry if registry is None else registry
+    klass_name  = klass if klass is None or isinstance(klass, str) else class_label(klass)
+
+    records = {}
+    for h in registry.snapshot().to_dict()["histograms"]:
+        if h["name"] not in ("pydlennon_instrumented_alloc_bytes", "pydlennon_instrumented_alloc_blocks"):
+            continue
+        key = (h["labels"]["class"], h["labels"]["attr"])
+        if klass_name is not None and key[0] != klass_name:
+            continue
+
+        record = records.setdefault(key, { "blocks" : None })
+        if h["name"].endswith("bytes"):
+            record["calls"] = sum(h["buckets"])
+            record["bytes"] = int(h["sum"])
+        else:
+            record["blocks"] = int(h["sum"])
+
+    report = [ AllocationRecord(k, a, r["calls"], r["bytes"], r["blocks"]) for (k, a), r in records.items() ]
+    return sorted(report, key = lambda r: r.bytes, reverse=True)
 
 
 # -----------------------------------------------------------------------------
 
 class InstrumentedDescriptor(object):
 
-    def __init__(self, klass, key, attr, logger):
-        self._klass     = klass
-        self._key       = key
-        self._attr      = attr
-        self._type      = type(attr)
-        self._logger    = logger
+    _kind = None
+
+    def __init__(self, klass, key, attr, logger, registry=None, allocations=None):
+        self._klass         = klass
+        self._key           = key
+        self._attr          = attr
+        self._type          = type(attr)
+        self._logger        = logger
+        self._allocations   = allocations
+
+        registry        = default_registry if registry is None else registry
+        self._counter   = registry.counter(
+                            "pydlennon_instrumented_access_total",
+                            { "class" : class_label(klass), "attr" : key, "kind" : self._kind },
+                            help = "Attribute accesses through Instrumented descriptors."
+                        )
 
 
-    def _log(self, prefix):
+    def _record(self):
+        self._counter.inc()
+        if not self._logger.isEnabledFor(logging.INFO):
+            return
+
         msg_template = "[{prefix}] {attr_name}"
         msg = msg_template.format(
                 attr_name   = self._key,
-                prefix      = prefix
+                prefix      = self._kind
             )
         self._logger.info(msg)
 
+    def _track(self, fn):
+        if self._allocations is None:
+            return fn
+        return self._allocations.wrap(fn)
+
 # -----------------------------------------------------------------------------
 
 class StaticmethodDescriptor(InstrumentedDescriptor):
+    _kind = "staticmethod"
+
     def __get__(self, instance, owner=None):
-        self._log("staticmethod")
-        return self._attr.__get__(None, self._klass)
+        self._record()
+        return self._track( self._attr.__get__(None, self._klass) )
 
 # -----------------------------------------------------------------------------
 
 class ClassmethodDescriptor(InstrumentedDescriptor):
+    _kind = "classmethod"
+
     def __get__(self, instance, owner=None):
-        self._log("classmethod")
-        return self._attr.__get__(None, self._klass)
+        self._record()
+        return self._track( self._attr.__get__(None, self._klass) )
 
 # -----------------------------------------------------------------------------
 
 class InstancemethodDescriptor(InstrumentedDescriptor):
+    _kind = "instance"
+
     def __get__(self, instance, owner=None):
-        self._log("instance")
-        return self._attr.__get__(instance, self._klass)
+        self._record()
+        return self._track( self._attr.__get__(instance, self._klass) )
 
 # -----------------------------------------------------------------------------
 
 class PropertyDescriptor(InstrumentedDescriptor):
+    _kind = "property"
+
     def __get__(self, instance, owner=None):
-        self._log("property")
-        return self._attr.__get__(instance, self._klass)
+        self._record()
+        if self._allocations is None:
+            return self._attr.__get__(instance, self._klass)
+        return self._allocations(self._attr.__get__, instance, self._klass)
 
 # -----------------------------------------------------------------------------
 
@@ -62,8 +213,11 @@ class Instrumented(object):
         types.FunctionType
     ]
 
-    def __init__(self, include = [], exclude=[]):
-        self._instrument = set( self.instrumentable ).difference( exclude )
+    def __init__(self, include = [], exclude=[], registry=None, track_allocations=False, allocation_sample=1):
+        self._instrument        = set( self.instrumentable ).difference( exclude )
+        self._registry          = registry
+        self._track_allocations = track_allocations
+        self._allocation_sample = allocation_sample
 
         if len(include) > 0:
             self._instrument = set( include ).intersection( self._instrument )
@@ -74,6 +228,11 @@ class Instrumented(object):
         setattr(klass, "_logger", logger)
         return logger
 
+    def _allocation_tracker(self, klass, key):
+        if not self._track_allocations:
+            return None
+        return AllocationTracker(klass, key, self._registry, self._allocation_sample)
+
     def __call__(self, klass):
         # Add the logger to the class
         logger = self._set_logger( klass )
@@ -92,22 +251,26 @@ class Instrumented(object):
             if isinstance(attr, staticmethod):
                 logger.debug( fmt(k, "staticmethod") )
                 if staticmethod in self._instrument:
-                    descriptor = StaticmethodDescriptor(klass, k, attr, logger)
+                    descriptor = StaticmethodDescriptor(klass, k, attr, logger, self._registry,
+                                    self._allocation_tracker(klass, k))
 
             elif isinstance(attr, classmethod):
                 logger.debug( fmt(k, "classmethod") )
                 if classmethod in self._instrument:
-                    descriptor = ClassmethodDescriptor(klass, k, attr, logger)
+                    descriptor = ClassmethodDescriptor(klass, k, attr, logger, self._registry,
+                                    self._allocation_tracker(klass, k))
             
             elif isinstance(attr, property):
                 logger.debug( fmt(k, "property") )
                 if property in self._instrument:
-                    descriptor = PropertyDescriptor(klass, k, attr, logger)
+                    descriptor = PropertyDescriptor(klass, k, attr, logger, self._registry,
+                                    self._allocation_tracker(klass, k))
             
             elif isinstance(attr, types.FunctionType):
                 logger.debug( fmt(k, "types.FunctionType") )
                 if types.FunctionType in self._instrument:
-                    descriptor = InstancemethodDescriptor(klass, k, attr, logger)
+                    descriptor = InstancemethodDescriptor(klass, k, attr, logger, self._registry,
+                                    self._allocation_tracker(klass, k))
 
             elif isinstance(attr, types.BuiltinMethodType):
                 logger.debug( fmt(k, "types.BuiltinMethodType") )
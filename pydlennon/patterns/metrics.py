@@ -0,0 +1,345 @@
+
+import array
+import bisect
+import json
+import threading
+import time
+
+# -----------------------------------------------------------------------------
+
+DEFAULT_BOUNDS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+def _zeros(typecode, n):
+    return array.array(typecode, bytes( array.array(typecode).itemsize * n ))
+
+def _grow(values, n):
+    """
+    Grow an array in place so that it holds at least n values.  Handles keep a
+    reference to the array itself, so it must never be replaced.
+    """
+    if len(values) < n:
+        values.extend( _zeros(values.typecode, max(n, 2 * len(values)) - len(values)) )
+
+def class_label(klass):
+    """
+    The label value for a class.  Qualified, so that same-named classes in different
+    modules or scopes do not share a metric.
+    """
+    return "{0}.{1}".format(klass.__module__, klass.__qualname__)
+
+def _labels(labels):
+    return tuple( sorted( (str(k), str(v)) for k,v in (labels or {}).items() ) )
+
+# -----------------------------------------------------------------------------
+
+class Counter(object):
+    """
+    A handle on a monotonic counter.  Increments are a single array update, and
+    are not locked: the read-modify-write can interleave between threads, so
+    concurrent increments of the same counter may be lost.  Counts from threads
+    sharing a proxy are therefore lower bounds.
+    """
+    __slots__ = ("_values", "_index")
+
+    def __init__(self, values, index):
+        self._values    = values
+        self._index     = index
+
+    def inc(self, n=1):
+        self._values[self._index] += n
+
+    @property
+    def value(self):
+        return self._values[self._index]
+
+# -----------------------------------------------------------------------------
+
+class _Timing(object):
+    __slots__ = ("_timer", "_start")
+
+    def __init__(self, timer):
+        self._timer = timer
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_typ, exc_value, exc_tb):
+        self._timer.observe( time.perf_counter() - self._start )
+
+
+class Timer(object):
+    """
+    A handle on a timer, recording the number and total duration of observations.
+    """
+    __slots__ = ("_counts", "_sums", "_index")
+
+    def __init__(self, counts, sums, index):
+        self._counts    = counts
+        self._sums      = sums
+        self._index     = index
+
+    def observe(self, seconds):
+        self._counts[self._index]   += 1
+        self._sums[self._index]     += seconds
+
+    def time(self):
+        return _Timing(self)
+
+    @property
+    def count(self):
+        return self._counts[self._index]
+
+    @property
+    def sum(self):
+        return self._sums[self._index]
+
+# -----------------------------------------------------------------------------
+
+class Histogram(object):
+    """
+    A handle on a histogram with fixed bucket upper bounds.  Bucket counts live in a
+    slice of an array shared by all histograms in the registry.
+    """
+    __slots__ = ("_buckets", "_sums", "_index", "_offset", "_bounds")
+
+    def __init__(self, buckets, sums, index, offset, bounds):
+        self._buckets   = buckets
+        self._sums      = sums
+        self._index     = index
+        self._offset    = offset
+        self._bounds    = bounds
+
+    def observe(self, value):
+        self._buckets[ self._offset + bisect.bisect_left(self._bounds, value) ] += 1
+        self._sums[self._index] += value
+
+    def time(self):
+        return _Timing(self)
+
+    @property
+    def count(self):
+        n = len(self._bounds) + 1
+        return sum( self._buckets[self._offset : self._offset + n] )
+
+    @property
+    def sum(self):
+        return self._sums[self._index]
+
+# -----------------------------------------------------------------------------
+
+class Snapshot(object):
+    """
+    A point-in-time copy of the values in a MetricsRegistry.  Metrics are only ever
+    appended to a registry, so an earlier snapshot describes a prefix of a later one.
+    """
+
+    def __init__(self, help, counters, counter_values, timers, timer_counts, timer_sums,
+                    histograms, histogram_buckets, histogram_sums):
+        self._help              = help
+        self.counters           = counters
+        self.counter_values     = counter_values
+        self.timers             = timers
+        self.timer_counts       = timer_counts
+        self.timer_sums         = timer_sums
+        self.histograms         = histograms
+        self.histogram_buckets  = histogram_buckets
+        self.histogram_sums     = histogram_sums
+
+    def diff(self, earlier):
+        """
+        The change in each metric since an earlier snapshot of the same registry.
+        """
+        def sub(a, b):
+            result = array.array(a.typecode, a)
+            for i in range(len(b)):
+                result[i] -= b[i]
+            return result
+
+        return Snapshot(
+            self._help,
+            self.counters,      sub(self.counter_values, earlier.counter_values),
+            self.timers,        sub(self.timer_counts, earlier.timer_counts),
+                                sub(self.timer_sums, earlier.timer_sums),
+            self.histograms,    sub(self.histogram_buckets, earlier.histogram_buckets),
+                                sub(self.histogram_sums, earlier.histogram_sums)
+        )
+
+    # ----
+
+    def _histogram_values(self):
+        for (name, labels, offset, bounds), total in zip(self.histograms, self.histogram_sums):
+            yield name, labels, bounds, self.histogram_buckets[offset : offset + len(bounds) + 1], total
+
+    def to_dict(self):
+        return {
+            "counters" : [
+                { "name" : name, "labels" : dict(labels), "value" : value }
+                for (name, labels), value in zip(self.counters, self.counter_values)
+            ],
+            "timers" : [
+                { "name" : name, "labels" : dict(labels), "count" : count, "sum" : total }
+                for (name, labels), count, total in zip(self.timers, self.timer_counts, self.timer_sums)
+            ],
+            "histograms" : [
+                {
+                    "name"      : name,
+                    "labels"    : dict(labels),
+                    "bounds"    : list(bounds),
+                    "buckets"   : list(buckets),
+                    "sum"       : total
+                }
+                for name, labels, bounds, buckets, total in self._histogram_values()
+            ]
+        }
+
+    def to_json(self, **kw):
+        return json.dumps(self.to_dict(), **kw)
+
+    def to_prometheus(self):
+        """
+        Render the snapshot in the Prometheus text exposition format.  Timers are
+        exported as summaries (_count and _sum only).
+        """
+        families    = {}
+        samples     = {}
+
+        def add(name, typ, suffix, labels, value):
+            if name not in families:
+                families[name]  = typ
+                samples[name]   = []
+            samples[name].append( "{0}{1}{2} {3}".format(name, suffix, _format_labels(labels), _format_value(value)) )
+
+        for (name, labels), value in zip(self.counters, self.counter_values):
+            add(name, "counter", "", labels, value)
+
+        for (name, labels), count, total in zip(self.timers, self.timer_counts, self.timer_sums):
+            add(name, "summary", "_count", labels, count)
+            add(name, "summary", "_sum", labels, total)
+
+        for name, labels, bounds, buckets, total in self._histogram_values():
+            cumulative = 0
+            for bound, count in zip(list(bounds) + [float("inf")], buckets):
+                cumulative += count
+                add(name, "histogram", "_bucket", labels + (("le", _format_value(bound)),), cumulative)
+            add(name, "histogram", "_count", labels, cumulative)
+            add(name, "histogram", "_sum", labels, total)
+
+        lines = []
+        for name, typ in families.items():
+            if self._help.get(name):
+                lines.append( "# HELP {0} {1}".format(name, self._help[name].replace("\\", "\\\\").replace("\n", "\\n")) )
+            lines.append( "# TYPE {0} {1}".format(name, typ) )
+            lines.extend( samples[name] )
+
+        return "".join( line + "\n" for line in lines )
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escape = lambda v: v.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+    return "{" + ",".join( '{0}="{1}"'.format(k, escape(v)) for k,v in labels ) + "}"
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(value)
+
+# -----------------------------------------------------------------------------
+
+class MetricsRegistry(object):
+    """
+    Counters, timers and histograms stored in preallocated arrays.  Registering a
+    metric returns a handle bound to its slot; updating through the handle does not
+    format, allocate or lock, so updates from concurrent threads may be lost (see
+    Counter).  Registration and snapshots are locked.  Registering the same name and 
+    labels twice returns a handle on the same slot.
+
+    Args:
+        capacity(int):      The number of slots initially allocated for each kind of
+                            metric.  The arrays grow as needed.
+    """
+
+    def __init__(self, capacity=256):
+        self._lock              = threading.Lock()
+        self._handles           = {}
+        self._help              = {}
+
+        self._counters          = []
+        self._counter_values    = _zeros('Q', capacity)
+
+        self._timers            = []
+        self._timer_counts      = _zeros('Q', capacity)
+        self._timer_sums        = _zeros('d', capacity)
+
+        self._histograms        = []
+        self._histogram_buckets = _zeros('Q', capacity)
+        self._histogram_sums    = _zeros('d', capacity)
+        self._histogram_used    = 0
+
+    def _register(self, kind, name, labels, help, create):
+        key = (kind, name, _labels(labels))
+        with self._lock:
+            try:
+                return self._handles[key]
+            except KeyError:
+                pass
+            if help:
+                self._help.setdefault(name, help)
+            handle = self._handles[key] = create(name, key[2])
+            return handle
+
+    def counter(self, name, labels=None, help=""):
+        def create(name, labels):
+            index = len(self._counters)
+            _grow(self._counter_values, index + 1)
+            self._counters.append( (name, labels) )
+            return Counter(self._counter_values, index)
+        return self._register("counter", name, labels, help, create)
+
+    def timer(self, name, labels=None, help=""):
+        def create(name, labels):
+            index = len(self._timers)
+            _grow(self._timer_counts, index + 1)
+            _grow(self._timer_sums, index + 1)
+            self._timers.append( (name, labels) )
+            return Timer(self._timer_counts, self._timer_sums, index)
+        return self._register("timer", name, labels, help, create)
+
+    def histogram(self, name, labels=None, help="", bounds=DEFAULT_BOUNDS):
+        bounds = tuple( sorted( float(b) for b in bounds ) )
+        def create(name, labels):
+            index   = len(self._histograms)
+            offset  = self._histogram_used
+            self._histogram_used += len(bounds) + 1
+            _grow(self._histogram_buckets, self._histogram_used)
+            _grow(self._histogram_sums, index + 1)
+            self._histograms.append( (name, labels, offset, bounds) )
+            return Histogram(self._histogram_buckets, self._histogram_sums, index, offset, bounds)
+        return self._register("histogram", name, labels, help, create)
+
+    def snapshot(self):
+        with self._lock:
+            n_counters      = len(self._counters)
+            n_timers        = len(self._timers)
+            n_histograms    = len(self._histograms)
+            return Snapshot(
+                dict(self._help),
+                self._counters[:n_counters],        self._counter_values[:n_counters],
+                self._timers[:n_timers],            self._timer_counts[:n_timers],
+                                                    self._timer_sums[:n_timers],
+                self._histograms[:n_histograms],    self._histogram_buckets[:self._histogram_used],
+                                                    self._histogram_sums[:n_histograms]
+            )
+
+    def to_prometheus(self):
+        return self.snapshot().to_prometheus()
+
+    def to_json(self, **kw):
+        return self.snapshot().to_json(**kw)
+
+# -----------------------------------------------------------------------------
+
+# The registry used by the Proxy and Instrumented decorators unless another is given
+default_registry = MetricsRegistry()
@@ -0,0 +1,177 @@
+
+import collections
+import threading
+import time
+
+from .metrics import default_registry
+
+# ------------------------------------------------------------------------------------
+
+class _Checkout(object):
+    __slots__ = ("_pool", "_delegate")
+
+    def __init__(self, pool):
+        self._pool = pool
+
+    def __enter__(self):
+        self._delegate = self._pool.acquire()
+        return self._delegate
+
+    def __exit__(self, exc_typ, exc_value, exc_tb):
+        self._pool.release(self._delegate)
+
+# ------------------------------------------------------------------------------------
+
+class DelegatePool(object):
+    """
+    A bounded pool of delegate instances, shared by threads.  Delegates are created on
+    demand, up to max_size, and reused most-recently-released first, so that rarely
+    needed delegates go idle and can be evicted.
+
+    Eviction is lazy: idle delegates are only evicted by acquire() and evict_idle().  A
+    pool that is no longer used keeps its idle delegates open, so callers holding 
+    delegates with external resources should call evict_idle() periodically.
+
+    Args:
+        factory(callable):          Creates a new delegate.
+        min_size(int):              The number of delegates created up front and never
+                                    evicted.
+        max_size(int):              The maximum number of delegates.
+        idle_timeout(float):        Seconds after which an idle delegate may be evicted, by 
+                                    the next acquire() or evict_idle(), or None.
+        timeout(float):             Seconds that acquire() waits for a delegate before
+                                    raising TimeoutError, or None to wait indefinitely.
+        on_evict(callable):         Called with each evicted delegate, e.g. to close it.
+        registry(MetricsRegistry):  Where wait times and pool events are recorded.  Defaults
+                                    to metrics.default_registry.
+        name(str):                  Labels the pool's metrics.
+    """
+
+    def __init__(self, factory, min_size=0, max_size=8, idle_timeout=None, timeout=None,
+                    on_evict=None, registry=None, name=""):
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError("Require 0 <= min_size <= max_size and max_size >= 1.")
+
+        self._factory       = factory
+        self._min_size      = min_size
+        self._max_size      = max_size
+        self._idle_timeout  = idle_timeout
+        self._timeout       = timeout
+        self._on_evict      = on_evict
+
+        self._cond          = threading.Condition()
+        self._idle          = collections.deque()
+        self._size          = 0
+
+        registry            = default_registry if registry is None else registry
+        labels              = { "pool" : name }
+        self._wait          = registry.histogram("pydlennon_pool_wait_seconds", labels,
+                                help = "Time spent waiting to check out a pooled delegate.")
+        self._created       = registry.counter("pydlennon_pool_created_total", labels,
+                                help = "Pooled delegates created.")
+        self._evicted       = registry.counter("pydlennon_pool_evicted_total", labels,
+                                help = "Idle pooled delegates evicted.")
+        self._timeouts      = registry.counter("pydlennon_pool_timeouts_total", labels,
+                                help = "Checkouts that timed out waiting for a pooled delegate.")
+
+        now = time.monotonic()
+        for _ in range(min_size):
+            self._idle.append( (factory(), now) )
+            self._size += 1
+            self._created.inc()
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def idle(self):
+        return len(self._idle)
+
+    # ----
+
+    def _evict(self, now):
+        """
+        Remove delegates idle for longer than idle_timeout, oldest first.  The lock must
+        be held.
+        """
+        evicted = []
+        if self._idle_timeout is None:
+            return evicted
+
+        while self._idle and self._size > self._min_size and now - self._idle[0][1] > self._idle_timeout:
+            evicted.append( self._idle.popleft()[0] )
+            self._size -= 1
+            self._evicted.inc()
+        return evicted
+
+    def _close(self, evicted):
+        if self._on_evict is not None:
+            for delegate in evicted:
+                self._on_evict(delegate)
+
+    def evict_idle(self):
+        with self._cond:
+            evicted = self._evict( time.monotonic() )
+        self._close(evicted)
+
+    # ----
+
+    def acquire(self):
+        start       = time.monotonic()
+        deadline    = None if self._timeout is None else start + self._timeout
+        evicted     = []
+        delegate    = None
+        timed_out   = False
+
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                evicted.extend( self._evict(now) )
+
+                if self._idle:
+                    delegate = self._idle.pop()[0]
+                    break
+
+                if self._size < self._max_size:
+                    self._size += 1
+                    break
+
+                if deadline is not None and now >= deadline:
+                    self._timeouts.inc()
+                    timed_out = True
+                    break
+
+                self._cond.wait( None if deadline is None else deadline - now )
+
+        waited = time.monotonic() - start
+
+        # on_evict runs without the lock held
+        self._close(evicted)
+        if timed_out:
+            raise TimeoutError("No pooled delegate became available within {0}s.".format(self._timeout))
+
+        self._wait.observe(waited)
+
+        if delegate is None:
+            try:
+                delegate = self._factory()
+            except BaseException:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            self._created.inc()
+
+        return delegate
+
+    def release(self, delegate):
+        with self._cond:
+            self._idle.append( (delegate, time.monotonic()) )
+            self._cond.notify()
+
+    def checkout(self):
+        """
+        A context manager that acquires a delegate and releases it on exit.
+        """
+        return _Checkout(self)
@@ -2,8 +2,13 @@
 import warnings
 import logging
 import functools 
+import inspect
+import operator
 import types
 
+from .metrics import class_label, default_registry
+from .pool import DelegatePool
+
 # ------------------------------------------------------------------------------------
 
 class ForwardingDescriptor(object):
@@ -16,9 +21,14 @@ class ForwardingDescriptor(object):
         delegate_name(str):     The attribute name of the descriptor instance in the container object
         attr_name(str):         The name of the attribute to forward.  A warning is generated if the 
                                 delegate does not have an attribute with this name.
+        registry(MetricsRegistry):  Where forwarded accesses are counted.  Defaults to 
+                                    metrics.default_registry.
+        klass(type):            The decorated class, used to label the counters.
+        slot(member_descriptor):    The slot holding the delegate, if the container class uses 
+                                    __slots__.  The delegate is then read through the slot directly.
     """
 
-    def __init__(self, typ, delegate_name, attr_name, logger):
+    def __init__(self, typ, delegate_name, attr_name, logger, registry=None, klass=None, slot=None):
         if not hasattr(typ, attr_name):
             msg = "The delegate type '{0}' does not provide attribute '{1}'.".format(typ.__name__, attr_name)
             logger.warning(msg)
@@ -28,7 +38,29 @@ class ForwardingDescriptor(object):
         self._attr_name         = attr_name
         self._logger            = logger
 
+        if slot is None:
+            self._get_delegate  = operator.attrgetter(delegate_name)
+        else:
+            self._get_delegate  = slot.__get__
+
+        registry    = default_registry if registry is None else registry
+        labels      = {
+            "class"     : "" if klass is None else class_label(klass),
+            "delegate"  : class_label(typ),
+            "attr"      : attr_name
+        }
+        counter     = lambda bound, op: registry.counter(
+                        "pydlennon_proxy_forwarded_total",
+                        dict(labels, bound=bound, op=op),
+                        help = "Attribute accesses forwarded by Proxy descriptors."
+                    )
+        self._class_getter      = counter("class", "getter")
+        self._instance_getter   = counter("instance", "getter")
+        self._instance_setter   = counter("instance", "setter")
+
     def _log(self, bound, descriptor):
+        if not self._logger.isEnabledFor(logging.INFO):
+            return
         msg_template = "{typename}<{bound}>.{attr_name}<{descriptor}>"
         msg = msg_template.format(
                 typename    = self._type.__name__,
@@ -40,17 +72,20 @@ class ForwardingDescriptor(object):
 
     def __get__(self, instance, owner=None):
         if instance is None:  
+            self._class_getter.inc()
             self._log("class", "getter")
             return getattr(self._type, self._attr_name)
         else:
+            self._instance_getter.inc()
             self._log("instance", "getter")
-            delegate_instance = getattr(instance, self._delegate_name)
+            delegate_instance = self._get_delegate(instance)
             return getattr(delegate_instance, self._attr_name)
 
     def __set__(self, instance, value):
+        self._instance_setter.inc()
         self._log("instance", "setter")
 
-        delegate_instance   = getattr(instance, self._delegate_name)
+        delegate_instance   = self._get_delegate(instance)
 
         # preserve context of delegate when setting methods
         if isinstance(value, types.MethodType):
@@ -63,23 +98,90 @@ class ForwardingDescriptor(object):
 
 # ------------------------------------------------------------------------------------
 
+class PooledForwardingDescriptor(ForwardingDescriptor):
+    """
+    A forwarding descriptor for a container that holds a DelegatePool rather than a 
+    delegate.  Each access checks out a delegate for its duration; methods are returned 
+    as a callable that checks out a delegate when called.  Static and class methods are 
+    forwarded to the delegate type without a checkout.
+
+    Setting a forwarded attribute is not supported, as it would only change whichever
+    delegate happened to be checked out.
+    """
+
+    def __init__(self, typ, delegate_name, attr_name, logger, registry=None, klass=None, slot=None):
+        super().__init__(typ, delegate_name, attr_name, logger, registry, klass, slot)
+
+        static = inspect.getattr_static(typ, attr_name, None)
+        self._static    = isinstance(static, (staticmethod, classmethod))
+        self._method    = callable( getattr(typ, attr_name, None) )
+
+    def __get__(self, instance, owner=None):
+        if instance is None or self._static:
+            return super().__get__(None, owner)
+
+        self._instance_getter.inc()
+        self._log("instance", "getter")
+
+        pool        = self._get_delegate(instance)
+        attr_name   = self._attr_name
+
+        if self._method:
+            def pooled(*args, **kw):
+                with pool.checkout() as delegate:
+                    return getattr(delegate, attr_name)(*args, **kw)
+            return pooled
+
+        with pool.checkout() as delegate:
+            return getattr(delegate, attr_name)
+
+    def __set__(self, instance, value):
+        msg = "Cannot set '{0}' on a pooled delegate.".format(self._attr_name)
+        raise AttributeError(msg)
+
+# ------------------------------------------------------------------------------------
+
+def _mangle(klass, name):
+    """
+    The attribute name under which klass stores a private (double underscore) name.
+    """
+    if not name.startswith("__") or name.endswith("__"):
+        return name
+    stripped = klass.__name__.lstrip("_")
+    return "_{0}{1}".format(stripped, name) if stripped else name
+
 class Proxy(object):
     """
     A decorator class that implements the proxy pattern.  It forwards to a delegate 
     by manipulating the descriptors.  
 
+    If the decorated class declares __slots__ and its instances have neither a __dict__
+    nor a slot for the delegate, the class is rebuilt with the delegate slot added.  The 
+    rebuilt class is created through the metaclass, so the metaclass __init__ and the 
+    bases' __init_subclass__ run for it again.
+
+    In pooled mode, __init__ must instead create a DelegatePool of delegate_type instances,
+    and each forwarded call runs on a delegate checked out of the pool.  This lets threads
+    share a proxy to delegates that are not thread-safe.
+
     Args:
 
         delegate_name (str):    The attribute name of the delegate instance
         delegate_type (str):    The type of the delegate object
         delegate_attrs (str):   The list of attribute names to be forwarded
+        registry (MetricsRegistry): Where forwarded accesses are counted.  Defaults to 
+                                    metrics.default_registry.
+        pooled (bool):          Whether the delegate attribute is a DelegatePool
     """
-    def __init__(self, delegate_name, delegate_type, delegate_attrs, logging_level=logging.ERROR):
+    def __init__(self, delegate_name, delegate_type, delegate_attrs, logging_level=logging.ERROR, 
+                    registry=None, pooled=False):
         self._delegate_name     = delegate_name
         self._delegate_type     = delegate_type
         self._delegate_typename = "{0}_type".format(delegate_name)
         self._delegate_attrs    = delegate_attrs
         self._logging_level     = logging_level
+        self._registry          = registry
+        self._pooled            = pooled
 
     def _set_logger(self, klass):
         logger_id = "{0}.{1}".format(__name__, klass.__name__)
@@ -90,6 +192,12 @@ class Proxy(object):
 
 
     def __call__(self, klass):
+        # Make room for the delegate in a slotted class
+        klass   = self._add_delegate_slot(klass)
+        slot    = klass.__dict__.get(self._delegate_name)
+        if not isinstance(slot, types.MemberDescriptorType):
+            slot = None
+
         # Add the delegate type to the class
         setattr(klass, self._delegate_typename, self._delegate_type)
 
@@ -102,7 +210,9 @@ class Proxy(object):
                 msg = "Overwriting an existing attribute '{0}'.".format(attr)
                 logger.warning(msg)
 
-            descriptor = ForwardingDescriptor(self._delegate_type, self._delegate_name, attr, logger)
+            Descriptor = PooledForwardingDescriptor if self._pooled else ForwardingDescriptor
+            descriptor = Descriptor(self._delegate_type, self._delegate_name, attr, logger,
+                                        self._registry, klass, slot)
             setattr(klass, attr, descriptor)
 
         # Rewrite the __init__ method to assert an instance of the delegate type exists 
@@ -114,11 +224,58 @@ class Proxy(object):
 
         return klass
 
+    def _add_delegate_slot(self, klass):
+        if "__slots__" not in klass.__dict__ or klass.__dictoffset__ != 0:
+            return klass
+        if isinstance(getattr(klass, self._delegate_name, None), types.MemberDescriptorType):
+            return klass
+
+        slots = klass.__dict__["__slots__"]
+        slots = (slots,) if isinstance(slots, str) else tuple(slots)
+
+        # The existing slot descriptors are recreated by type(), under their mangled names
+        namespace = dict(klass.__dict__)
+        for name in slots + ("__dict__", "__weakref__"):
+            namespace.pop(_mangle(klass, name), None)
+        namespace["__slots__"] = slots + (self._delegate_name,)
+
+        slotted = type(klass)(klass.__name__, klass.__bases__, namespace)
+        slotted.__qualname__ = klass.__qualname__
+
+        # Descriptors added by an earlier Proxy read their delegate through the old slots
+        for attr in namespace.values():
+            if isinstance(attr, ForwardingDescriptor):
+                slot = slotted.__dict__.get(attr._delegate_name)
+                if isinstance(slot, types.MemberDescriptorType):
+                    attr._get_delegate = slot.__get__
+
+        # Methods using zero-argument super() close over the original class
+        for attr in namespace.values():
+            if isinstance(attr, (staticmethod, classmethod)):
+                functions = [attr.__func__]
+            elif isinstance(attr, property):
+                functions = [attr.fget, attr.fset, attr.fdel]
+            else:
+                functions = [attr]
+
+            for fn in functions:
+                if not isinstance(fn, types.FunctionType) or fn.__closure__ is None:
+                    continue
+                for name, cell in zip(fn.__code__.co_freevars, fn.__closure__):
+                    if name == "__class__" and cell.cell_contents is klass:
+                        cell.cell_contents = slotted
+
+        return slotted
+
     def _wrap_init(self, klass):
         var_name        = self._delegate_name
         var_type        = self._delegate_type
         var_typename    = ".".join([self._delegate_type.__module__, self._delegate_type.__name__])
 
+        if self._pooled:
+            var_type        = DelegatePool
+            var_typename    = "DelegatePool[{0}]".format(var_typename)
+
         msg    =    "The Proxy decorator requires that {decorated_typename}.__init__ " \
                     "creates an instance variable of type '{delegate_typename}' and " \
                     "named '{delegate_name}'.".format(
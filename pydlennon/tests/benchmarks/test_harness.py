@@ -0,0 +1,107 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from pydlennon.benchmarks import harness
+
+
+class HarnessTestCase(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(harness, "_benchmarks", [])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    # ----
+
+    def test_run(self):
+        @harness.benchmark("a.timing", repeat=1)
+        def timing():
+            return lambda: None
+
+        @harness.measurement("a.size", "B")
+        def size():
+            return 40
+
+        @harness.measurement("b.broken", "B")
+        def broken():
+            raise ValueError("no")
+
+        results = harness.run()
+
+        self.assertEqual(results["a.timing"]["unit"], "s")
+        self.assertGreater(results["a.timing"]["value"], 0)
+        self.assertEqual(results["a.size"], { "value" : 40, "unit" : "B" })
+        self.assertEqual(results["b.broken"], { "error" : "ValueError: no" })
+
+        self.assertEqual(set(harness.run("a.*")), {"a.timing", "a.size"})
+
+    # ----
+
+    def test_compare(self):
+        baseline = {
+            "fast"      : { "value" : 1.0, "unit" : "s" },
+            "slow"      : { "value" : 1.0, "unit" : "s" },
+            "broken"    : { "value" : 1.0, "unit" : "s" },
+            "missing"   : { "value" : 1.0, "unit" : "s" },
+            "other"     : { "value" : 1.0, "unit" : "s" },
+            "errored"   : { "error" : "ValueError" },
+        }
+        results = {
+            "fast"      : { "value" : 1.05, "unit" : "s" },
+            "slow"      : { "value" : 1.5, "unit" : "s" },
+            "broken"    : { "error" : "ValueError: no" },
+            "errored"   : { "error" : "ValueError: no" },
+            "new"       : { "value" : 9.0, "unit" : "s" },
+        }
+
+        self.assertEqual(harness.compare(results, baseline, 0.1), [
+            ("broken", 1.0, None),
+            ("missing", 1.0, None),
+            ("other", 1.0, None),
+            ("slow", 1.0, 1.5),
+        ])
+
+        # baseline entries outside the pattern did not run
+        self.assertEqual(
+            [ name for name, _, _ in harness.compare(results, baseline, 0.1, "[fsbm]*") ],
+            ["broken", "missing", "slow"]
+        )
+        self.assertEqual(harness.compare(results, baseline, 0.01, "fast"), [("fast", 1.0, 1.05)])
+
+    # ----
+
+    def test_save_load(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+
+        path    = os.path.join(tmpdir, "results.json")
+        results = { "a" : { "value" : 1.5, "unit" : "s" }, "b" : { "error" : "ValueError: no" } }
+
+        harness.save(path, results)
+        self.assertEqual(harness.load(path), results)
+
+    # ----
+
+    def test_report(self):
+        results     = { "a" : { "value" : 2.0, "unit" : "s" }, "b" : { "error" : "ValueError: no" } }
+        baseline    = { "a" : { "value" : 1.0, "unit" : "s" }, "c" : { "value" : 1.0, "unit" : "s" } }
+        regressions = harness.compare(results, baseline, 0.1)
+
+        out = io.StringIO()
+        harness.report(results, baseline, regressions, file=out)
+        lines = out.getvalue().splitlines()
+
+        self.assertEqual(len(lines), 3)
+        self.assertIn("+100.0%", lines[0])
+        self.assertTrue(lines[0].endswith("REGRESSION"))
+        self.assertIn("ERROR ValueError: no", lines[1])
+        self.assertIn("MISSING", lines[2])
+        self.assertTrue(lines[2].endswith("REGRESSION"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+from pydlennon.contexts.seeded_rng import SeededRng
+
+
+class SeededRngTestCase(unittest.TestCase):
+
+    def _fill(self, n, **kw):
+        out = numpy.empty(n)
+        with SeededRng(42) as rng:
+            rng.fill(out, block_size=1000, **kw)
+        return out
+
+    # ----
+
+    def test_generator(self):
+        with SeededRng(42) as rng:
+            x = rng.standard_normal(10)
+        numpy.testing.assert_array_equal(x, numpy.random.default_rng(42).standard_normal(10))
+
+        with self.assertRaises(AttributeError):
+            rng.standard_normal
+
+    # ----
+
+    def test_fill_threads(self):
+        x = self._fill(10500, threads=1)
+        y = self._fill(10500, threads=4)
+
+        numpy.testing.assert_array_equal(x, y)
+        self.assertEqual(len(numpy.unique(x)), x.size)
+
+    # ----
+
+    def test_fill_repeated(self):
+        x = numpy.empty(100)
+        y = numpy.empty(100)
+        with SeededRng(42) as rng:
+            rng.fill(x)
+            rng.fill(y)
+
+        self.assertFalse(numpy.array_equal(x, y))
+        numpy.testing.assert_array_equal(x, self._fill(100))
+
+    # ----
+
+    def test_fill_seed_types(self):
+        seedseq = numpy.random.SeedSequence(42)
+        rng     = SeededRng(seedseq)
+
+        x = numpy.empty(100)
+        y = numpy.empty(100)
+        with rng:
+            rng.fill(x)
+        with rng:
+            rng.fill(y)
+
+        numpy.testing.assert_array_equal(x, y)
+        numpy.testing.assert_array_equal(x, self._fill(100))
+        self.assertEqual(seedseq.n_children_spawned, 0)
+
+        with SeededRng(numpy.random.default_rng(42)) as rng:
+            rng.fill(y)
+        numpy.testing.assert_array_equal(x, y)
+
+    # ----
+
+    def test_fill_memmap(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            out = numpy.memmap(os.path.join(tmpdir, "x.dat"), dtype="float32", mode="w+", shape=(50, 40))
+            with SeededRng(42) as rng:
+                rng.fill(out, "standard_gamma", block_size=1000, shape=2.0)
+            out.flush()
+
+            self.assertTrue((out > 0).all())
+            del out
+        finally:
+            shutil.rmtree(tmpdir)
+
+    # ----
+
+    def test_fill_errors(self):
+        rng = SeededRng(42)
+        with self.assertRaises(RuntimeError):
+            rng.fill(numpy.empty(10))
+
+        with rng:
+            with self.assertRaises(ValueError):
+                rng.fill(numpy.empty(10), "integers")
+            with self.assertRaises(ValueError):
+                rng.fill(numpy.empty((10, 10))[:, ::2])
+
+
+if __name__ == '__main__':
+    unittest.main()
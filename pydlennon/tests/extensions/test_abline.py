@@ -0,0 +1,149 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import pydlennon.extensions.matplotlib
+from pydlennon.extensions.matplotlib.abline import LineAbCollection
+from pydlennon.extensions.matplotlib.blit import BlitManager
+
+
+class _AxesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        pydlennon.extensions.matplotlib.install()
+
+        self.figure = Figure()
+        FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot()
+        self.ax.set_xlim(0, 10)
+        self.ax.set_ylim(0, 10)
+
+
+class AblinesTestCase(_AxesTestCase):
+
+    def _segments(self, intercepts, slopes):
+        lines = self.ax.ablines(intercepts, slopes)
+        self.figure.canvas.draw()
+        return lines.get_segments()
+
+    # ----
+
+    def test_clipping(self):
+        segments = self._segments([0, 5, 12], [1, 0, -2])
+
+        # y = x, clipped to the view box
+        np.testing.assert_allclose(segments[0], [[0, 0], [10, 10]])
+
+        # flat line spans the view
+        np.testing.assert_allclose(segments[1], [[0, 5], [10, 5]])
+
+        # y = 12 - 2x enters the view at x = 1 and leaves at x = 6
+        np.testing.assert_allclose(segments[2], [[1, 10], [6, 0]])
+
+    # ----
+
+    def test_outside_view(self):
+        segments = self._segments([20, -5, 5], [0, -1, 0])
+
+        # lines that miss the view are kept, so per-line properties stay aligned,
+        # but have no drawable vertices
+        self.assertEqual(len(segments), 3)
+        for segment in segments[:2]:
+            self.assertTrue(len(segment) == 0 or np.isnan(segment).all())
+        np.testing.assert_allclose(segments[2], [[0, 5], [10, 5]])
+
+    # ----
+
+    def test_inverted_limits(self):
+        self.ax.set_xlim(10, 0)
+        segments = self._segments([0], [1])
+        np.testing.assert_allclose(segments[0], [[0, 0], [10, 10]])
+
+    # ----
+
+    def test_broadcast(self):
+        segments = np.array(self._segments(2, [0, 1, 2]))
+        self.assertEqual(segments.shape, (3, 2, 2))
+        np.testing.assert_allclose(segments[:, 0], [[0, 2]] * 3)
+
+        with self.assertRaises(ValueError):
+            LineAbCollection([0, 1], [0, 1, 2])
+
+    # ----
+
+    def test_autoscale_once(self):
+        with mock.patch.object(self.ax, "_request_autoscale_view") as request:
+            self.ax.ablines(np.zeros(100), np.arange(100))
+        self.assertEqual(request.call_count, 1)
+
+    # ----
+
+    def test_set_coefficients(self):
+        lines = self.ax.ablines([0], [1])
+        self.figure.canvas.draw()
+
+        lines.set_coefficients([5, 2], [0, 0])
+        self.assertTrue(lines.stale)
+        self.figure.canvas.draw()
+
+        np.testing.assert_allclose(lines.get_segments(), [[[0, 5], [10, 5]], [[0, 2], [10, 2]]])
+
+
+class AblineTestCase(_AxesTestCase):
+
+    # ----
+
+    def _endpoints(self, line):
+        # The display coordinates where the line meets the view box
+        return line.get_transform().transform([[0, 0], [1, 1]])
+
+    def _data(self, xy):
+        return self.ax.transData.inverted().transform(xy)
+
+    def test_abline(self):
+        line = self.ax.abline(2, 0.5)
+        self.figure.canvas.draw()
+
+        np.testing.assert_allclose(self._data(self._endpoints(line)), [[0, 2], [10, 7]], atol=1e-9)
+        self.assertIn(line, self.ax.lines)
+
+    def test_set_coefficients(self):
+        line = self.ax.abline(2, 0.5)
+        self.figure.canvas.draw()
+
+        line.set_coefficients(8, -1)
+        self.assertTrue(line.stale)
+        self.figure.canvas.draw()
+
+        np.testing.assert_allclose(self._data(self._endpoints(line)), [[0, 8], [8, 0]], atol=1e-9)
+
+    def test_blit(self):
+        canvas  = self.figure.canvas
+        lines   = self.ax.ablines([0], [1], animated=True)
+        bm      = BlitManager(canvas, [lines])
+        self.assertTrue(lines.get_animated())
+
+        canvas.draw()
+        background = bm._background
+        self.assertIsNotNone(background)
+
+        lines.set_coefficients([5], [0])
+        with mock.patch.object(canvas, "restore_region", wraps=canvas.restore_region) as restore, \
+                mock.patch.object(canvas, "blit", wraps=canvas.blit) as blit, \
+                mock.patch.object(canvas, "draw", wraps=canvas.draw) as draw:
+            bm.update()
+
+        restore.assert_called_once_with(background)
+        blit.assert_called_once_with(self.figure.bbox)
+        draw.assert_not_called()
+        np.testing.assert_allclose(lines.get_segments(), [[[0, 5], [10, 5]]])
+
+        bm.disconnect()
+
+
+if __name__ == '__main__':
+    unittest.main()
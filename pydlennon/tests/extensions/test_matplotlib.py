@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import pydlennon
+
+
+class MatplotlibImportTestCase(unittest.TestCase):
+
+    # Import time budget for pydlennon.extensions.matplotlib, in seconds
+    import_budget = 0.05
+
+    def _run(self, code):
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            [ os.path.dirname(os.path.dirname(pydlennon.__file__)), env.get("PYTHONPATH", "") ]
+        )
+        env["MPLBACKEND"] = "Agg"
+        result = subprocess.run(
+            [sys.executable, "-c", code], 
+            env = env, 
+            capture_output = True, 
+            text = True,
+            check = True
+        )
+        return result.stdout.split()
+
+    # ----
+
+    def test_import_is_lazy(self):
+        elapsed, loaded = self._run(
+            "import sys, time\n"
+            "t = time.perf_counter()\n"
+            "import pydlennon.extensions.matplotlib\n"
+            "print(time.perf_counter() - t, 'matplotlib' in sys.modules)\n"
+        )
+
+        self.assertEqual(loaded, "False")
+        self.assertLess(float(elapsed), self.import_budget)
+
+    # ----
+
+    def test_deferred_install(self):
+        output = self._run(
+            "import pydlennon.extensions.matplotlib\n"
+            "import matplotlib.pyplot as plt\n"
+            "fig, ax = plt.subplots()\n"
+            "print(hasattr(ax, 'abline'), hasattr(ax, 'ablines'))\n"
+        )
+        self.assertEqual(output, ["True", "True"])
+
+    # ----
+
+    def test_install(self):
+        output = self._run(
+            "import matplotlib.axes\n"
+            "import pydlennon.extensions.matplotlib as ext\n"
+            "ext.install()\n"
+            "print(hasattr(matplotlib.axes.Axes, 'ablines'))\n"
+        )
+        self.assertEqual(output, ["True"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from patsy import LookupFactor, ModelDesc, Term, Treatment
+
+from pydlennon.extensions.patsy.patsy import FullRankOneHot, EvalFactorRenamed, LookupFactorRenamed
+from pydlennon.extensions.patsy.cache import DesignMatrixCache, fingerprint
+
+
+class DesignMatrixCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.df = pd.DataFrame(
+            {
+                'a' : [1.0, 2.0, 3.0],
+                'w' : pd.Categorical(['x', 'y', 'x'])
+            },
+            index = [5, 6, 7]
+        )
+        self.datafile = os.path.join(self.tmpdir, 'data.csv')
+        self.df.to_csv(self.datafile)
+
+        self.cache = DesignMatrixCache(os.path.join(self.tmpdir, 'cache'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _desc(self, name):
+        factors = [
+            LookupFactorRenamed('a'),
+            EvalFactorRenamed('C(w, FullRankOneHot)').set_name(name)
+        ]
+        return ModelDesc([], [Term([])] + [ Term([f]) for f in factors ])
+
+    # ----
+
+    def test_hit_does_not_load_data(self):
+        loads = []
+        def load():
+            loads.append(True)
+            return self.df
+
+        desc = self._desc('w')
+        fp = fingerprint(self.datafile)
+
+        X = self.cache.dmatrix(desc, load, fp)
+        Y = self.cache.dmatrix(desc, load, fp)
+
+        self.assertEqual(len(loads), 1)
+        self.assertIsInstance(Y.base.base, np.memmap)
+        self.assertEqual(Y.design_info.column_names, ['Intercept', 'w[I.x]', 'w[I.y]', 'a'])
+        np.testing.assert_array_equal(X, Y)
+
+    # ----
+
+    def test_dataframe(self):
+        desc = self._desc('w')
+        fp = fingerprint(self.datafile)
+
+        self.cache.dmatrix(desc, self.df, fp)
+        X = self.cache.dmatrix(desc, self.df, fp, return_type='dataframe')
+
+        self.assertEqual(list(X.index), [5, 6, 7])
+        self.assertEqual(list(X.columns), ['Intercept', 'w[I.x]', 'w[I.y]', 'a'])
+
+    # ----
+
+    def _roundtrip(self, index):
+        df = self.df.set_axis(index)
+        desc = self._desc('w')
+        return self.cache.dmatrix(desc, df, fingerprint(self.datafile), return_type='dataframe').index
+
+    def test_multiindex(self):
+        index = pd.MultiIndex.from_arrays([['a', 'b', 'c'], [1, 2, 3]], names=['k', 'n'])
+        self.assertTrue(self._roundtrip(index).equals(index))
+        self.assertEqual(list(self._roundtrip(index).names), ['k', 'n'])
+
+    def test_string_index(self):
+        index = pd.Index(['a', 'b', 'c'], dtype=object, name='k')
+        result = self._roundtrip(index)
+
+        self.assertTrue(result.equals(index))
+        self.assertEqual(result.dtype, object)
+
+    def test_datetime_tz_index(self):
+        index = pd.date_range('2020-01-01', periods=3, tz='America/New_York', name='t')
+        result = self._roundtrip(index)
+
+        self.assertTrue(result.equals(index))
+        self.assertEqual(result.dtype, index.dtype)
+
+    def test_unsupported_index(self):
+        with self.assertRaises(ValueError):
+            self._roundtrip(pd.Index(['a', 1, 2.5], dtype=object))
+
+        # the matrix was cached anyway
+        loads = []
+        def load():
+            loads.append(True)
+            return self.df
+
+        X = self.cache.dmatrix(self._desc('w'), load, fingerprint(self.datafile))
+        self.assertEqual(loads, [])
+        self.assertEqual(X.shape, (3, 4))
+
+    # ----
+
+    def test_key(self):
+        fp = fingerprint(self.datafile)
+
+        self.assertNotEqual(
+            self.cache.key(self._desc('w'), fp),
+            self.cache.key(self._desc('work'), fp)
+        )
+        self.assertNotEqual(
+            self.cache.key(self._desc('w'), fp),
+            self.cache.key(self._desc('w'), fingerprint(self.datafile, content=True))
+        )
+
+
+    def test_key_contrasts(self):
+        fp = fingerprint(self.datafile)
+
+        def desc(contrast):
+            w = LookupFactor('w', force_categorical=True, contrast=contrast)
+            return ModelDesc([], [Term([]), Term([w])])
+
+        X = self.cache.dmatrix(desc(FullRankOneHot()), self.df, fp)
+        Y = self.cache.dmatrix(desc(Treatment), self.df, fp)
+
+        self.assertEqual(X.design_info.column_names, ['Intercept', 'w[I.x]', 'w[I.y]'])
+        self.assertEqual(Y.design_info.column_names, ['Intercept', 'w[T.y]'])
+        self.assertNotEqual(
+            self.cache.key(desc(Treatment), fp),
+            self.cache.key(desc(Treatment(reference='y')), fp)
+        )
+
+    def test_key_unknown_factor(self):
+        class Factor(object):
+            def name(self):
+                return 'f'
+
+        with self.assertRaises(ValueError):
+            self.cache.key(ModelDesc([], [Term([Factor()])]), fingerprint(self.datafile))
+
+
+if __name__ == '__main__':
+    unittest.main()
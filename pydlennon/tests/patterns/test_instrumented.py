@@ -1,8 +1,12 @@
+import gc
+import inspect
 import re
 import unittest
 import logging
+import tracemalloc
 
-from pydlennon.patterns.instrumented import Instrumented
+from pydlennon.patterns.instrumented import Instrumented, allocation_report
+from pydlennon.patterns.metrics import MetricsRegistry
 
 class InstrumentedTestCase(unittest.TestCase):
 
@@ -259,5 +263,108 @@ class InstrumentedTestCase(unittest.TestCase):
         ])
 
 
+    def _traced(self, fn):
+        # Isolate the measurements from collection of unrelated garbage
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        gc.collect()
+        gc.disable()
+        try:
+            fn()
+        finally:
+            gc.enable()
+            if not was_tracing:
+                tracemalloc.stop()
+
+    def _allocating_class(self, **kw):
+        @Instrumented(**kw)
+        class Foo(object):
+            def __init__(self):
+                self.store = []
+
+            def allocates(self):
+                self.store.append( [ object() for _ in range(1000) ] )
+
+            def noop(self):
+                pass
+
+            @classmethod
+            def c(cls):
+                return cls
+
+            @property
+            def p(self):
+                return bytearray(100000)
+
+        return Foo
+
+    def test_track_allocations(self):
+        registry    = MetricsRegistry()
+        Foo         = self._allocating_class(registry=registry, track_allocations=True)
+        kept        = []
+
+        def calls():
+            foo = Foo()
+            for _ in range(3):
+                foo.allocates()
+                foo.noop()
+            kept.append(foo.p)
+
+        self._traced(calls)
+
+        report = allocation_report(Foo, registry)
+        self.assertEqual([ r.attr for r in report[:2] ], ["p", "allocates"])
+
+        records = { r.attr : r for r in report }
+        self.assertEqual(records["allocates"].calls, 3)
+        self.assertGreaterEqual(records["allocates"].blocks, 3000)
+        self.assertGreater(records["p"].bytes, 90000)
+        self.assertEqual((records["noop"].bytes, records["noop"].blocks), (0, 0))
+
+    def test_allocation_sample(self):
+        registry    = MetricsRegistry()
+        Foo         = self._allocating_class(registry=registry, track_allocations=True, allocation_sample=4)
+
+        def calls():
+            foo = Foo()
+            for _ in range(8):
+                foo.allocates()
+                foo.noop()
+
+        self._traced(calls)
+
+        records = { r.attr : r for r in allocation_report(Foo, registry) }
+        self.assertEqual(records["allocates"].calls, 2)
+        self.assertIsNone(records["allocates"].blocks)
+        self.assertGreaterEqual(records["allocates"].bytes, 2 * 1000 * object().__sizeof__())
+        # Sampled calls are measured unfiltered, so the call itself is counted
+        self.assertLess(records["noop"].bytes, 1024)
+
+    def test_allocations_require_tracing(self):
+        if tracemalloc.is_tracing():
+            self.skipTest("tracemalloc is already tracing")
+
+        registry    = MetricsRegistry()
+        Foo         = self._allocating_class(registry=registry, track_allocations=True)
+        foo         = Foo()
+
+        with self.assertWarns(RuntimeWarning):
+            foo.allocates()
+        foo.allocates()
+
+        self.assertFalse(tracemalloc.is_tracing())
+        records = { r.attr : r for r in allocation_report(Foo, registry) }
+        self.assertEqual(records["allocates"].calls, 0)
+
+    def test_tracked_methods_are_bound(self):
+        Foo = self._allocating_class(registry=MetricsRegistry(), track_allocations=True)
+        foo = Foo()
+
+        self.assertTrue(inspect.ismethod(foo.allocates))
+        self.assertIs(foo.allocates.__self__, foo)
+        self.assertIs(foo.c.__self__, Foo)
+        self.assertIs(foo.c(), Foo)
+
 if __name__ == '__main__':
     unittest.main()
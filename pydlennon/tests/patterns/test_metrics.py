@@ -0,0 +1,148 @@
+import json
+import unittest
+
+from pydlennon.patterns.metrics import MetricsRegistry, class_label
+from pydlennon.patterns.proxy import Proxy
+from pydlennon.patterns.instrumented import Instrumented
+
+
+class MetricsRegistryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = MetricsRegistry(capacity=1)
+
+    # ----
+
+    def test_counter(self):
+        a = self.registry.counter("calls_total", {"attr" : "a"})
+        b = self.registry.counter("calls_total", {"attr" : "b"})
+        a.inc()
+        a.inc(2)
+        b.inc()
+
+        # growing the arrays must not detach existing handles
+        self.assertIs(self.registry.counter("calls_total", {"attr" : "a"}), a)
+        self.assertEqual((a.value, b.value), (3, 1))
+
+    # ----
+
+    def test_timer_and_histogram(self):
+        timer = self.registry.timer("latency_seconds")
+        timer.observe(0.5)
+        with timer.time():
+            pass
+
+        histogram = self.registry.histogram("size_bytes", bounds=[10, 100])
+        for v in [1, 10, 50, 1000]:
+            histogram.observe(v)
+
+        self.assertEqual(timer.count, 2)
+        self.assertGreaterEqual(timer.sum, 0.5)
+        self.assertEqual(histogram.count, 4)
+
+        self.assertEqual(self.registry.snapshot().to_dict()["histograms"], [{
+            "name"      : "size_bytes",
+            "labels"    : {},
+            "bounds"    : [10.0, 100.0],
+            "buckets"   : [2, 1, 1],
+            "sum"       : 1061.0
+        }])
+
+    # ----
+
+    def test_snapshot_diff(self):
+        a = self.registry.counter("calls_total", {"attr" : "a"})
+        a.inc(5)
+        before = self.registry.snapshot()
+
+        a.inc()
+        self.registry.counter("calls_total", {"attr" : "b"}).inc(2)
+        after = self.registry.snapshot()
+
+        values = [ c["value"] for c in after.diff(before).to_dict()["counters"] ]
+        self.assertEqual(values, [1, 2])
+        self.assertEqual(before.to_dict()["counters"][0]["value"], 5)
+
+    # ----
+
+    def test_prometheus(self):
+        self.registry.counter("calls_total", {"attr" : 'a"b'}, help="Calls.").inc()
+        self.registry.histogram("size_bytes", bounds=[10]).observe(5)
+
+        self.assertEqual(self.registry.to_prometheus(), 
+            "# HELP calls_total Calls.\n"
+            "# TYPE calls_total counter\n"
+            'calls_total{attr="a\\"b"} 1\n'
+            "# TYPE size_bytes histogram\n"
+            'size_bytes_bucket{le="10.0"} 1\n'
+            'size_bytes_bucket{le="+Inf"} 1\n'
+            "size_bytes_count 1\n"
+            "size_bytes_sum 5.0\n"
+        )
+
+    # ----
+
+    def test_json(self):
+        self.registry.timer("latency_seconds", {"attr" : "a"}).observe(1.0)
+        self.assertEqual(json.loads(self.registry.to_json())["timers"], [
+            { "name" : "latency_seconds", "labels" : {"attr" : "a"}, "count" : 1, "sum" : 1.0 }
+        ])
+
+    # ----
+
+    def test_decorators(self):
+        class Foo(object):
+            def f(self):
+                return "foo.f"
+
+        @Proxy("foo", Foo, ['f'], registry=self.registry)
+        class Bar(object):
+            def __init__(self):
+                self.foo = Foo()
+
+        @Instrumented(registry=self.registry)
+        class Qux(Foo):
+            pass
+
+        Bar().f()
+        Qux().f()
+        Qux().f()
+
+        counters = { 
+            (c["name"], c["labels"]["class"], c["labels"].get("bound"), c["labels"].get("op")) : c["value"]
+            for c in self.registry.snapshot().to_dict()["counters"] 
+            if c["labels"]["attr"] == "f"
+        }
+
+        self.assertEqual(counters[("pydlennon_proxy_forwarded_total", class_label(Bar), "instance", "getter")], 1)
+        self.assertEqual(counters[("pydlennon_instrumented_access_total", class_label(Qux), None, None)], 2)
+
+    # ----
+
+    def test_class_labels(self):
+        class Foo(object):
+            def f(self):
+                pass
+
+        class Outer(object):
+            class Foo(object):
+                def f(self):
+                    pass
+
+        A = Instrumented(registry=self.registry)(Foo)
+        B = Instrumented(registry=self.registry)(Outer.Foo)
+        A().f()
+        B().f()
+
+        # same-named classes from different scopes have their own counters
+        counters = { 
+            c["labels"]["class"] : c["value"]
+            for c in self.registry.snapshot().to_dict()["counters"] 
+            if c["labels"]["attr"] == "f" 
+        }
+        self.assertEqual(counters, { class_label(A) : 1, class_label(B) : 1 })
+        self.assertEqual(class_label(B), __name__ + ".MetricsRegistryTestCase.test_class_labels.<locals>.Outer.Foo")
+
+
+if __name__ == '__main__':
+    unittest.main()
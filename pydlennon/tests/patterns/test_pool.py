@@ -0,0 +1,121 @@
+import threading
+import time
+import unittest
+
+from pydlennon.patterns.metrics import MetricsRegistry
+from pydlennon.patterns.pool import DelegatePool
+
+
+class DelegatePoolTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def _pool(self, **kw):
+        return DelegatePool(object, registry=self.registry, **kw)
+
+    # ----
+
+    def test_reuse(self):
+        pool = self._pool(min_size=1, max_size=2)
+        self.assertEqual((pool.size, pool.idle), (1, 1))
+
+        with pool.checkout() as a:
+            with pool.checkout() as b:
+                self.assertIsNot(a, b)
+                self.assertEqual((pool.size, pool.idle), (2, 0))
+
+        # the most recently released delegate is reused first
+        with pool.checkout() as c:
+            self.assertIs(c, a)
+
+    # ----
+
+    def test_timeout(self):
+        pool = self._pool(max_size=1, timeout=0.01)
+
+        with pool.checkout():
+            with self.assertRaises(TimeoutError):
+                pool.acquire()
+
+        timeouts = [ c["value"] for c in self.registry.snapshot().to_dict()["counters"] 
+                        if c["name"] == "pydlennon_pool_timeouts_total" ]
+        self.assertEqual(timeouts, [1])
+
+    # ----
+
+    def test_idle_eviction(self):
+        evicted = []
+        pool    = self._pool(min_size=1, max_size=3, idle_timeout=0.01, on_evict=evicted.append)
+
+        with pool.checkout(), pool.checkout(), pool.checkout():
+            pass
+        self.assertEqual(pool.size, 3)
+
+        time.sleep(0.02)
+        pool.evict_idle()
+
+        self.assertEqual((pool.size, len(evicted)), (1, 2))
+
+    # ----
+
+    def test_wait_excludes_eviction(self):
+        pool = self._pool(max_size=2, idle_timeout=0.01, on_evict=lambda d: time.sleep(0.05))
+
+        with pool.checkout(), pool.checkout():
+            pass
+        time.sleep(0.02)
+
+        before = self.registry.snapshot()
+        with pool.checkout():
+            pass
+
+        waits = [ h["sum"] for h in self.registry.snapshot().diff(before).to_dict()["histograms"]
+                    if h["name"] == "pydlennon_pool_wait_seconds" ]
+        self.assertEqual(pool.size, 1)
+        self.assertLess(waits[0], 0.05)
+
+    # ----
+
+    def test_factory_error(self):
+        pool = DelegatePool(lambda: 1 / 0, max_size=1, registry=self.registry)
+
+        with self.assertRaises(ZeroDivisionError):
+            pool.acquire()
+        self.assertEqual(pool.size, 0)
+
+    # ----
+
+    def test_threads(self):
+        pool    = self._pool(max_size=2)
+        lock    = threading.Lock()
+        in_use  = set()
+        peak    = []
+
+        def work():
+            for _ in range(50):
+                with pool.checkout() as delegate:
+                    with lock:
+                        self.assertNotIn(id(delegate), in_use)
+                        in_use.add(id(delegate))
+                        peak.append(len(in_use))
+                    time.sleep(0)
+                    with lock:
+                        in_use.remove(id(delegate))
+
+        threads = [ threading.Thread(target=work) for _ in range(8) ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertLessEqual(max(peak), 2)
+        self.assertEqual(len(peak), 400)
+
+        wait = self.registry.snapshot().to_dict()["histograms"][0]
+        self.assertEqual(wait["name"], "pydlennon_pool_wait_seconds")
+        self.assertEqual(sum(wait["buckets"]), 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
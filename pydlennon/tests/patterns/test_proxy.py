@@ -1,7 +1,9 @@
 import unittest
 import logging
 import sys
+import threading
 
+from pydlennon.patterns.pool import DelegatePool
 from pydlennon.patterns.proxy import Proxy
 
 class _NamedMixin(object):
@@ -152,6 +154,166 @@ class ProxyTestCase(unittest.TestCase):
         self.assertEqual(xyzzy.g(), "42.foo")
         self.assertEqual(xyzzy.c(), "42.Foo")
 
+    # ----
+
+    def test_slots(self):
+        Foo = self.Foo
+
+        class Base(object):
+            __slots__ = ()
+
+            def f(self):
+                return "Base.f"
+
+        @Proxy("foo", Foo, ['c', 'g'])
+        class FooProxy(Base):
+            __slots__ = ("x",)
+
+            def __init__(self):
+                self.x   = 1
+                self.foo = Foo()
+
+            def f(self):
+                return "FooProxy." + super().f()
+
+        foo_proxy = FooProxy()
+
+        self.assertFalse(hasattr(foo_proxy, "__dict__"))
+        self.assertEqual(FooProxy.__slots__, ("x", "foo"))
+        self.assertEqual(foo_proxy.x, 1)
+        self.assertEqual(foo_proxy.g(), "foo.g")
+        self.assertEqual(foo_proxy.f(), "FooProxy.Base.f")
+
+        with self.assertRaises(AttributeError):
+            foo_proxy.y = 2
+
+    # ----
+
+    def test_slots_with_delegate(self):
+        Foo = self.Foo
+
+        class FooProxy(object):
+            __slots__ = ("foo",)
+
+            def __init__(self):
+                self.foo = Foo()
+
+        self.assertIs(Proxy("foo", Foo, ['g'])(FooProxy), FooProxy)
+        self.assertEqual(FooProxy().g(), "foo.g")
+
+    # ----
+
+    def test_slots_stacked(self):
+        Foo = self.Foo
+
+        @Proxy("foo", Foo, ['f'])
+        @Proxy("bar", Foo, ['g'])
+        class FooProxy(object):
+            __slots__ = ()
+
+            def __init__(self):
+                self.foo = Foo()
+                self.bar = Foo()
+
+        foo_proxy = FooProxy()
+
+        self.assertFalse(hasattr(foo_proxy, "__dict__"))
+        self.assertEqual(FooProxy.__slots__, ("bar", "foo"))
+        self.assertEqual(foo_proxy.f(), "foo.f")
+        self.assertEqual(foo_proxy.g(), "foo.g")
+
+    # ----
+
+    def test_slots_private(self):
+        Foo = self.Foo
+
+        @Proxy("foo", Foo, ['g'])
+        class FooProxy(object):
+            __slots__ = ("__x",)
+
+            def __init__(self):
+                self.__x = 1
+                self.foo = Foo()
+
+            @property
+            def x(self):
+                return self.__x
+
+        foo_proxy = FooProxy()
+
+        self.assertEqual(foo_proxy.x, 1)
+        self.assertEqual(foo_proxy.g(), "foo.g")
+
+    # ----
+
+    def test_pooled(self):
+        class Counter(object):
+            value = 0
+
+            def __init__(self):
+                self.owner = None
+
+            @classmethod
+            def c(cls):
+                return "Counter.c"
+
+            def inc(self):
+                # Fails if two threads share a delegate
+                me = threading.get_ident()
+                assert self.owner is None
+                self.owner = me
+                self.value += 1
+                self.owner = None
+                return self.value
+
+        created = []
+        def factory():
+            created.append( Counter() )
+            return created[-1]
+
+        @Proxy("counter", Counter, ['c', 'inc', 'value'], pooled=True)
+        class CounterProxy(object):
+            def __init__(self):
+                self.counter = DelegatePool(factory, max_size=2)
+
+        proxy   = CounterProxy()
+        errors  = []
+
+        def run():
+            try:
+                for _ in range(100):
+                    proxy.inc()
+            except BaseException as e:
+                errors.append(e)
+
+        threads = [ threading.Thread(target=run) for _ in range(4) ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(created), 2)
+        self.assertEqual(sum( c.value for c in created ), 400)
+        self.assertEqual(proxy.c(), "Counter.c")
+        self.assertIn(proxy.value, [ c.value for c in created ])
+
+        with self.assertRaises(AttributeError):
+            proxy.value = 0
+
+    # ----
+
+    def test_pooled_init(self):
+        Foo = self.Foo
+
+        @Proxy("foo", Foo, ['g'], pooled=True)
+        class FooProxy(object):
+            def __init__(self):
+                self.foo = Foo()
+
+        with self.assertRaises(TypeError):
+            FooProxy()
+
 
 # -----------------------------------------------------------------------------
 